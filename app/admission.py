@@ -0,0 +1,90 @@
+"""
+Admission control for expensive analytics queries.
+
+Each kind of analytics query gets its own limiter: only a few run at the same
+time, a bounded number may wait for a free slot, and everything beyond that
+(or waiting too long) is answered right away with 503 and a Retry-After
+header. Cheap endpoints like /health never go through a limiter, so they stay
+fast when the analytics endpoints are busy.
+"""
+import asyncio
+import math
+import os
+from functools import wraps
+from fastapi import HTTPException
+
+ANALYTICS_MAX_CONCURRENT = int(os.getenv("ANALYTICS_MAX_CONCURRENT", "4"))
+ANALYTICS_MAX_WAITING = int(os.getenv("ANALYTICS_MAX_WAITING", "16"))
+ANALYTICS_WAIT_TIMEOUT_SECONDS = float(os.getenv("ANALYTICS_WAIT_TIMEOUT_SECONDS", "2"))
+# Server-side time limit for one analytics aggregation
+ANALYTICS_MAX_TIME_MS = int(os.getenv("ANALYTICS_MAX_TIME_MS", "10000"))
+
+
+class AdmissionLimiter:
+    """
+    A semaphore with a bounded, time-limited wait queue.
+
+    Use as "async with limiter:" around the expensive part of a request.
+    """
+
+    def __init__(self, name: str,
+                 max_concurrent: int = ANALYTICS_MAX_CONCURRENT,
+                 max_waiting: int = ANALYTICS_MAX_WAITING,
+                 wait_timeout: float = ANALYTICS_WAIT_TIMEOUT_SECONDS):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        # Both counters change without awaiting, so a burst of requests that
+        # arrive in the same event loop tick still sees an honest total
+        self.active = 0
+        self.waiting = 0
+        # Created on first use, inside the server's event loop
+        self._semaphore = None
+
+    def overloaded(self, reason: str) -> HTTPException:
+        return HTTPException(
+            status_code=503,
+            detail=f"Too many {self.name} requests ({reason}), please retry shortly",
+            headers={"Retry-After": str(max(1, math.ceil(self.wait_timeout)))}
+        )
+
+    async def __aenter__(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        if self.active + self.waiting >= self.max_concurrent + self.max_waiting:
+            raise self.overloaded("queue full")
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.wait_timeout)
+        except asyncio.TimeoutError:
+            raise self.overloaded("timed out waiting")
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.active -= 1
+        self._semaphore.release()
+        if exc_type is not None:
+            # The driver is already loaded by now, importing it here keeps startup lean
+            from pymongo.errors import ExecutionTimeout
+            if issubclass(exc_type, ExecutionTimeout):
+                raise self.overloaded("query took too long") from exc
+        return False
+
+
+def admission_limited(limiter: AdmissionLimiter):
+    """
+    Run an async function only after the limiter admits it.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            async with limiter:
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
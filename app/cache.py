@@ -0,0 +1,82 @@
+"""
+In-process cache for analytics results.
+
+Every worker process has its own cache, but all of them look at the same data
+version document in MongoDB (bumped by the turbine loader). When the version
+changes, each worker drops its cached results, so several workers never keep
+serving results computed from old data.
+"""
+import os
+import time
+from collections import OrderedDict
+from functools import wraps
+from app.power_curve_store import get_data_version
+
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "256"))
+# How often (in seconds) a worker asks MongoDB for the current data version
+CACHE_VERSION_CHECK_SECONDS = float(os.getenv("CACHE_VERSION_CHECK_SECONDS", "5"))
+
+
+class VersionedCache:
+    """
+    A small LRU cache that empties itself when the data version changes.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES,
+                 version_check_seconds: float = CACHE_VERSION_CHECK_SECONDS):
+        self.max_entries = max_entries
+        self.version_check_seconds = version_check_seconds
+        self._entries = OrderedDict()
+        self._version = None
+        self._checked_at = 0.0
+
+    async def current_version(self, refresh: bool = False) -> int:
+        """
+        Return the data version, asking MongoDB at most every few seconds
+        (or right now with refresh=True).
+        """
+        now = time.monotonic()
+        if refresh or self._version is None or now - self._checked_at >= self.version_check_seconds:
+            version = await get_data_version()
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            self._checked_at = now
+        return self._version
+
+    async def get_or_compute(self, key, compute):
+        """Return the cached value for key, or await compute() and remember it."""
+        version = await self.current_version()
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        value = await compute()
+        # If the data was reloaded while we were computing, the result may be
+        # built from old data: return it to this caller but don't keep it
+        if self._version == version:
+            self._entries[key] = value
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self._version = None
+
+
+# Shared by all analytics helpers in this process
+analytics_cache = VersionedCache()
+
+
+def cached(cache: VersionedCache = analytics_cache):
+    """
+    Cache the result of an async function by its name and arguments.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            return await cache.get_or_compute(key, lambda: func(*args, **kwargs))
+        return wrapper
+    return decorator
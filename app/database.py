@@ -1,16 +1,26 @@
 import os
-from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import MongoClient
-from dotenv import load_dotenv
+from functools import lru_cache
 
-load_dotenv()
+# The drivers and python-dotenv are imported inside the functions below, so
+# importing this module (and app.main) stays cheap. The API only ever loads
+# Motor, the loaders only ever load the synchronous pymongo client.
 
-MONGODB_URL = os.getenv("MONGODB_URL")
-DATABASE_NAME = os.getenv("DATABASE_NAME")
+
+@lru_cache(maxsize=1)
+def get_settings():
+    """Read the connection settings (and the .env file) the first time they're needed."""
+    from dotenv import load_dotenv
+    load_dotenv()
+    return {
+        "mongodb_url": os.getenv("MONGODB_URL"),
+        "database_name": os.getenv("DATABASE_NAME"),
+        # Connections each worker opens up front, so the first requests don't pay for them
+        "min_pool_size": int(os.getenv("MONGODB_MIN_POOL_SIZE", "5")),
+    }
 
 # Create a class to hold the database connection
 class DB:
-    client: AsyncIOMotorClient = None
+    client = None  # AsyncIOMotorClient once connected
     database = None
 
 # Create a single instance of this class to be shared
@@ -18,9 +28,15 @@ db = DB()
 
 # --- Asynchronous connection for FastAPI ---
 async def connect_to_mongo():
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    settings = get_settings()
     print("Connecting to MongoDB (Async)...")
-    db.client = AsyncIOMotorClient(MONGODB_URL)
-    db.database = db.client[DATABASE_NAME]
+    # tz_aware: timestamps come back as UTC datetimes, not naive ones
+    db.client = AsyncIOMotorClient(
+        settings["mongodb_url"], minPoolSize=settings["min_pool_size"], tz_aware=True
+    )
+    db.database = db.client[settings["database_name"]]
     print("Connected to MongoDB (Async)")
 
 async def close_mongo_connection():
@@ -31,7 +47,10 @@ async def close_mongo_connection():
 # --- Synchronous connection for the data loader ---
 def get_sync_db():
     """Provides a temporary synchronous database client for the data loader."""
+    from pymongo import MongoClient
+
+    settings = get_settings()
     print("Connecting to MongoDB (Sync)...")
-    sync_client = MongoClient(MONGODB_URL)
-    sync_db = sync_client[DATABASE_NAME]
+    sync_client = MongoClient(settings["mongodb_url"])
+    sync_db = sync_client[settings["database_name"]]
     return sync_db, sync_client
@@ -0,0 +1,285 @@
+"""
+Live turbine readings for Server-Sent Events clients.
+
+Each turbine has at most one feed, however many clients listen to it. The
+feed reads new readings from a MongoDB change stream, or - when MongoDB runs
+without a replica set and change streams are not available - by polling the
+collection once per interval. Every new reading updates the turbine's running
+statistics and is copied into the queue of each subscriber.
+
+Reloading the data (./start.sh load) deletes and re-inserts every reading.
+Those inserts are not new readings: the feed ignores them and loads its
+statistics again once the loader bumps the data version.
+"""
+import asyncio
+import os
+from typing import Dict, Optional, Set
+from pydantic import ValidationError
+from app.cache import analytics_cache
+from app.database import db
+from app.power_curve_store import VERSION_COLLECTION, get_data_version
+from app.turbine_models import TurbineReading
+
+# How often a feed looks for new readings when change streams are not available
+LIVE_POLL_SECONDS = float(os.getenv("LIVE_POLL_SECONDS", "5"))
+# Events a slow client may fall behind before the oldest ones are dropped
+SUBSCRIBER_QUEUE_SIZE = 100
+# Wait before a failed feed tries again; doubles on every failure up to the maximum
+LIVE_RETRY_SECONDS = 1
+LIVE_MAX_RETRY_SECONDS = 60
+# MongoDB error code for "$changeStream is only supported on replica sets"
+CHANGE_STREAM_NOT_SUPPORTED = 40573
+
+
+def _lower(current, value):
+    return value if current is None else min(current, value)
+
+
+def _higher(current, value):
+    return value if current is None else max(current, value)
+
+
+class RunningStatistics:
+    """
+    Statistics of a turbine that are updated one reading at a time.
+    Uses the same keys as /turbines/{id}/statistics.
+    """
+
+    def __init__(self, turbine_id: int, initial: Optional[dict] = None):
+        initial = initial or {}
+        self.turbine_id = turbine_id
+        self.count = initial.get("count", 0)
+        self.wind_sum = initial.get("avg_wind_speed", 0) * self.count
+        self.power_sum = initial.get("total_energy", 0)
+        self.min_wind_speed = initial.get("min_wind_speed")
+        self.max_wind_speed = initial.get("max_wind_speed")
+        self.min_power = initial.get("min_power")
+        self.max_power = initial.get("max_power")
+
+    def add(self, reading: TurbineReading):
+        self.count += 1
+        self.wind_sum += reading.wind_speed
+        self.power_sum += reading.power_output
+        self.min_wind_speed = _lower(self.min_wind_speed, reading.wind_speed)
+        self.max_wind_speed = _higher(self.max_wind_speed, reading.wind_speed)
+        self.min_power = _lower(self.min_power, reading.power_output)
+        self.max_power = _higher(self.max_power, reading.power_output)
+
+    def as_dict(self) -> dict:
+        return {
+            "turbine_id": self.turbine_id,
+            "count": self.count,
+            "avg_wind_speed": round(self.wind_sum / self.count, 2) if self.count else None,
+            "min_wind_speed": self.min_wind_speed,
+            "max_wind_speed": self.max_wind_speed,
+            "avg_power": round(self.power_sum / self.count, 2) if self.count else None,
+            "min_power": self.min_power,
+            "max_power": self.max_power,
+            "total_energy": round(self.power_sum, 2)
+        }
+
+
+class TurbineFeed:
+    """
+    One source of new readings for one turbine, shared by all its subscribers.
+    """
+
+    def __init__(self, turbine_id: int):
+        self.turbine_id = turbine_id
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.statistics: Optional[RunningStatistics] = None
+        # Data version the statistics were loaded from (None = not loaded yet)
+        self.data_version: Optional[int] = None
+        # Set while the collection is being reloaded, until the version changes
+        self.reloading = False
+        self.use_change_stream = True
+        # epoch_minute of the newest reading counted in the statistics
+        self.last_seen: Optional[int] = None
+        self.retry_delay = LIVE_RETRY_SECONDS
+        self.task: Optional[asyncio.Task] = None
+
+    def send(self, event: dict):
+        for queue in self.subscribers:
+            if queue.full():
+                # Drop the oldest event instead of slowing everyone down
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def publish(self, reading: TurbineReading):
+        """Update the statistics and hand the reading to every subscriber."""
+        if self.statistics is None:
+            self.statistics = RunningStatistics(self.turbine_id)
+        self.statistics.add(reading)
+
+        self.send({
+            "reading": reading.model_dump(mode="json"),
+            "statistics": self.statistics.as_dict()
+        })
+
+    def publish_document(self, doc: dict):
+        """
+        Publish a reading straight from MongoDB. Skips documents that don't
+        validate and readings that are not newer than the last one we counted.
+        """
+        epoch_minute = doc.get("epoch_minute")
+        if epoch_minute is not None:
+            if self.last_seen is not None and epoch_minute <= self.last_seen:
+                return
+            self.last_seen = epoch_minute
+        doc.pop("_id", None)
+        try:
+            reading = TurbineReading(**doc)
+        except ValidationError as e:
+            print(f"Skipping invalid reading for turbine {self.turbine_id}: {e}")
+            return
+        self.publish(reading)
+
+    async def load_statistics(self):
+        """
+        (Re)load the statistics and the newest reading time for the current
+        data version.
+        """
+        # Imported here because turbine_routes imports this module
+        from app.turbine_routes import compute_statistics
+
+        # Refreshing the version also empties the cache if the data changed,
+        # so compute_statistics doesn't answer from the old data
+        data_version = await analytics_cache.current_version(refresh=True)
+        initial = await compute_statistics(self.turbine_id, None, None, "all")
+        latest = await db.database.turbines.find_one(
+            {"turbine_id": self.turbine_id}, sort=[("epoch_minute", -1)]
+        )
+        self.statistics = RunningStatistics(self.turbine_id, initial)
+        self.last_seen = latest["epoch_minute"] if latest else -1
+        self.data_version = data_version
+        self.reloading = False
+
+    async def run(self):
+        """
+        Keep the feed going: on any error, tell the subscribers, wait (with
+        growing back-off) and start again where we left off.
+        """
+        # The driver is already loaded by now, importing it here keeps startup lean
+        from pymongo.errors import OperationFailure
+
+        while True:
+            try:
+                if self.data_version is None:
+                    await self.load_statistics()
+
+                if self.use_change_stream:
+                    try:
+                        await self.watch_change_stream()
+                    except OperationFailure as e:
+                        # Only a server without a replica set makes us poll for good;
+                        # anything else is retried below like any other error
+                        if e.code != CHANGE_STREAM_NOT_SUPPORTED:
+                            raise
+                        print(f"Change stream unavailable for turbine {self.turbine_id}, polling instead: {e}")
+                        self.use_change_stream = False
+                        continue
+                else:
+                    await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Live feed for turbine {self.turbine_id} failed, retrying in {self.retry_delay}s: {e}")
+                self.send({"error": f"Live feed for turbine {self.turbine_id} interrupted, retrying"})
+                await asyncio.sleep(self.retry_delay)
+                self.retry_delay = min(self.retry_delay * 2, LIVE_MAX_RETRY_SECONDS)
+
+    async def watch_change_stream(self):
+        pipeline = [{
+            "$match": {
+                "$or": [
+                    # New readings of this turbine
+                    {"ns.coll": "turbines", "operationType": "insert",
+                     "fullDocument.turbine_id": self.turbine_id},
+                    # A reload starting (the loader deletes every reading first)
+                    {"ns.coll": "turbines", "operationType": {"$in": ["delete", "drop", "rename"]}},
+                    {"operationType": {"$in": ["dropDatabase", "invalidate"]}},
+                    # A reload finishing
+                    {"ns.coll": VERSION_COLLECTION}
+                ]
+            }
+        }]
+        async with db.database.watch(pipeline) as stream:
+            # The version may have changed while no stream was open
+            if await get_data_version() != self.data_version:
+                await self.load_statistics()
+            self.retry_delay = LIVE_RETRY_SECONDS
+
+            async for change in stream:
+                if change.get("ns", {}).get("coll") == VERSION_COLLECTION:
+                    await self.load_statistics()
+                elif change["operationType"] != "insert":
+                    self.reloading = True
+                elif not self.reloading:
+                    self.publish_document(change["fullDocument"])
+
+    async def poll(self):
+        while True:
+            await asyncio.sleep(LIVE_POLL_SECONDS)
+            if await get_data_version() != self.data_version:
+                # Reloaded: start counting from the new data
+                await self.load_statistics()
+                continue
+
+            cursor = db.database.turbines.find(
+                {"turbine_id": self.turbine_id, "epoch_minute": {"$gt": self.last_seen}}
+            ).sort("epoch_minute", 1)
+            async for doc in cursor:
+                self.publish_document(doc)
+            self.retry_delay = LIVE_RETRY_SECONDS
+
+
+class LiveUpdateHub:
+    """
+    Keeps one feed per turbine running while it has at least one subscriber.
+    """
+
+    def __init__(self):
+        self.feeds: Dict[int, TurbineFeed] = {}
+
+    def subscribe(self, turbine_id: int, queue: Optional[asyncio.Queue] = None) -> asyncio.Queue:
+        """
+        Start receiving events for a turbine. Pass the same queue for several
+        turbines to get all of them in one place.
+        """
+        feed = self.feeds.get(turbine_id)
+        if feed is None:
+            feed = self.feeds[turbine_id] = TurbineFeed(turbine_id)
+        if feed.task is None or feed.task.done():
+            feed.task = asyncio.create_task(feed.run())
+
+        if queue is None:
+            queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        feed.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, turbine_id: int, queue: asyncio.Queue):
+        feed = self.feeds.get(turbine_id)
+        if feed is None:
+            return
+        feed.subscribers.discard(queue)
+        if not feed.subscribers:
+            # Last client left: stop reading from the database
+            if feed.task:
+                feed.task.cancel()
+            del self.feeds[turbine_id]
+
+    def publish(self, reading: TurbineReading):
+        """Push a reading from inside the process (e.g. an ingest endpoint)."""
+        feed = self.feeds.get(reading.turbine_id)
+        if feed is not None:
+            feed.publish(reading)
+
+    def close(self):
+        for feed in self.feeds.values():
+            if feed.task:
+                feed.task.cancel()
+        self.feeds.clear()
+
+
+# Shared by all clients of this worker
+hub = LiveUpdateHub()
@@ -1,18 +1,64 @@
+import asyncio
+from datetime import datetime
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from typing import List
 from fastapi.middleware.cors import CORSMiddleware
 from app.database import connect_to_mongo, close_mongo_connection, db
 from app.models import Post, Comment, User, UserPostCount, PostWithCommentCount
 from app import turbine_routes
+from app.live_updates import hub
+
+
+# The range the frontend opens with (see frontend/src/App.jsx); its power
+# curve and statistics are computed before the worker reports ready
+PRIMED_START_TIME = datetime(2016, 1, 1, 0, 0, 0)
+PRIMED_END_TIME = datetime(2016, 3, 31, 23, 59, 59)
+WARM_UP_RETRY_SECONDS = 2
+
+
+async def warm_up(app: FastAPI):
+    """
+    Open database connections and fill the analytics cache with what the
+    frontend asks for first, then mark the worker as ready. Retries until
+    the database answers.
+    """
+    while True:
+        try:
+            await db.database.command("ping")
+            await asyncio.gather(*[
+                query
+                for turbine_id in turbine_routes.KNOWN_TURBINE_IDS
+                for query in (
+                    turbine_routes.compute_reading_count(turbine_id, "all"),
+                    turbine_routes.compute_power_curve(
+                        turbine_id, PRIMED_START_TIME, PRIMED_END_TIME, 0.5, "all"
+                    ),
+                    turbine_routes.compute_statistics(
+                        turbine_id, PRIMED_START_TIME, PRIMED_END_TIME, "all"
+                    )
+                )
+            ])
+            break
+        except Exception as e:
+            print(f"Warm-up failed, retrying in {WARM_UP_RETRY_SECONDS}s: {e}")
+            await asyncio.sleep(WARM_UP_RETRY_SECONDS)
+
+    app.state.ready = True
+    print("Warm-up finished, worker is ready")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await connect_to_mongo()
+    app.state.ready = False
+    warm_up_task = asyncio.create_task(warm_up(app))
     yield
     # Shutdown
+    warm_up_task.cancel()
+    hub.close()
     await close_mongo_connection()
 
 
@@ -184,3 +230,17 @@ async def health_check():
             "database": "disconnected",
             "error": str(e)
         }
+
+
+@app.get("/ready", tags=["Health"])
+async def readiness_check():
+    """
+    Check if this worker has finished warming up and can take traffic.
+
+    Unlike /health this stays 503 until the connection pool is open and the
+    frontend's first requests (turbine list, power curve and statistics for
+    its default date range) are cached.
+    """
+    if not getattr(app.state, "ready", False):
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready"}
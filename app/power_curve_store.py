@@ -0,0 +1,326 @@
+"""
+Stored monthly power curves.
+
+Old readings don't change once they are loaded, so we keep one partial power
+curve per turbine and month. Each bin keeps the power sum and the reading
+count (not the average), which means partial curves can simply be added up:
+a quarter is three monthly curves merged together. Any other time range is
+served the same way, with only the days before its first and after its last
+whole month read from the readings.
+
+Every load of the turbines collection bumps a data version. Stored curves
+remember the version they were built from and get rebuilt when it changes.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from app.admission import ANALYTICS_MAX_TIME_MS, AdmissionLimiter
+from app.database import db
+from app.quality import QUALITY_OPTIONS, quality_filter
+from app.time_utils import DATA_TIMEZONE, data_tzinfo, from_epoch_minute, to_epoch_minute
+from app.turbine_models import PowerCurvePoint
+
+DEFAULT_WIND_SPEED_INTERVAL = 0.5
+# Only these bin sizes are kept in the store; others are computed per request
+STORED_WIND_SPEED_INTERVALS = (0.5, 1.0)
+# Longest period (in months) one request may ask for
+MAX_PERIOD_MONTHS = 120
+STORE_COLLECTION = "power_curve_store"
+VERSION_COLLECTION = "data_versions"
+TURBINES_VERSION_ID = "turbines"
+
+# Limits how many months are computed from raw readings at the same time
+store_limiter = AdmissionLimiter("power curve store")
+
+
+def wind_speed_bin(wind_speed_interval: float) -> dict:
+    """Aggregation expression that rounds wind speed down to its bin."""
+    return {
+        "$multiply": [
+            {"$floor": {"$divide": ["$wind_speed", wind_speed_interval]}},
+            wind_speed_interval
+        ]
+    }
+
+
+def month_bounds(period: str) -> Tuple[datetime, datetime]:
+    """Turn "2016-01" into (start of January, start of February), in the data time zone."""
+    start = datetime.strptime(period, "%Y-%m").replace(tzinfo=data_tzinfo())
+    if start.month == 12:
+        end = start.replace(year=start.year + 1, month=1)
+    else:
+        end = start.replace(month=start.month + 1)
+    return start, end
+
+
+def next_month(period: str) -> str:
+    """The month after "2016-01", i.e. "2016-02"."""
+    return month_bounds(period)[1].strftime("%Y-%m")
+
+
+def parse_period(period: str) -> List[str]:
+    """
+    Turn a period into the list of months it covers.
+
+    Accepts a single month ("2016-01") or an inclusive range ("2016-01..2016-03")
+    of at most MAX_PERIOD_MONTHS months. Raises ValueError for anything else.
+    """
+    first, _, last = period.partition("..")
+    last = last or first
+    start, _ = month_bounds(first.strip())
+    stop, _ = month_bounds(last.strip())
+    if stop < start:
+        raise ValueError(f"Period {period} ends before it starts")
+    if (stop.year - start.year) * 12 + stop.month - start.month + 1 > MAX_PERIOD_MONTHS:
+        raise ValueError(f"Period {period} is longer than {MAX_PERIOD_MONTHS} months")
+
+    months = []
+    current = start
+    while current <= stop:
+        months.append(current.strftime("%Y-%m"))
+        current = month_bounds(months[-1])[1]
+    return months
+
+
+def whole_months_between(start_time: Optional[datetime], end_time: Optional[datetime]) -> List[str]:
+    """
+    The months that lie completely inside a time range (end included, to the
+    minute, like the API's time filters).
+
+    Returns [] for open-ended ranges and for ranges over MAX_PERIOD_MONTHS
+    months; those are scanned from the readings instead.
+    """
+    if start_time is None or end_time is None:
+        return []
+    start_minute = to_epoch_minute(start_time)
+    end_minute = to_epoch_minute(end_time)
+
+    current = from_epoch_minute(start_minute).astimezone(data_tzinfo()).strftime("%Y-%m")
+    if to_epoch_minute(month_bounds(current)[0]) < start_minute:
+        current = next_month(current)
+
+    months = []
+    while to_epoch_minute(month_bounds(current)[1]) - 1 <= end_minute:
+        months.append(current)
+        if len(months) > MAX_PERIOD_MONTHS:
+            return []
+        current = next_month(current)
+    return months
+
+
+def monthly_curves_pipeline(match: dict, wind_speed_interval: float) -> list:
+    """
+    Aggregation that returns one partial power curve per turbine and month.
+    """
+    return [
+        {"$match": match},
+        # Sum power and count readings per month and wind speed bin
+        {
+            "$group": {
+                "_id": {
+                    "turbine_id": "$turbine_id",
+                    "period": {
+                        "$dateToString": {
+                            "format": "%Y-%m", "date": "$timestamp", "timezone": DATA_TIMEZONE
+                        }
+                    },
+                    "wind_speed": wind_speed_bin(wind_speed_interval)
+                },
+                "power_sum": {"$sum": "$power_output"},
+                "reading_count": {"$sum": 1},
+                "first_time": {"$min": "$timestamp"},
+                "last_time": {"$max": "$timestamp"}
+            }
+        },
+        # Collect the bins of each month into one document
+        {
+            "$group": {
+                "_id": {"turbine_id": "$_id.turbine_id", "period": "$_id.period"},
+                "bins": {
+                    "$push": {
+                        "wind_speed": "$_id.wind_speed",
+                        "power_sum": "$power_sum",
+                        "reading_count": "$reading_count",
+                        "first_time": "$first_time",
+                        "last_time": "$last_time"
+                    }
+                }
+            }
+        }
+    ]
+
+
+def merge_partial_curves(partials: List[dict]) -> List[PowerCurvePoint]:
+    """
+    Add partial curves together and turn them into power curve points.
+    """
+    merged: Dict[float, List[float]] = {}
+    for partial in partials:
+        for curve_bin in partial["bins"]:
+            totals = merged.setdefault(curve_bin["wind_speed"], [0.0, 0])
+            totals[0] += curve_bin["power_sum"]
+            totals[1] += curve_bin["reading_count"]
+
+    return [
+        PowerCurvePoint(
+            wind_speed=wind_speed,
+            average_power=round(power_sum / reading_count, 2),
+            reading_count=reading_count
+        )
+        for wind_speed, (power_sum, reading_count) in sorted(merged.items())
+        if reading_count
+    ]
+
+
+def partial_time_range(partials: List[dict]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """First and last reading time covered by some partial curves (None if they are empty)."""
+    first = [b["first_time"] for p in partials for b in p["bins"] if b.get("first_time")]
+    last = [b["last_time"] for p in partials for b in p["bins"] if b.get("last_time")]
+    return (min(first) if first else None), (max(last) if last else None)
+
+
+def store_document(turbine_id: int, period: str, wind_speed_interval: float,
+                   quality: str, bins: list, data_version: int) -> dict:
+    """The document we keep for one turbine, month, bin size and quality option."""
+    return {
+        "turbine_id": turbine_id,
+        "period": period,
+        "wind_speed_interval": wind_speed_interval,
+        "quality": quality,
+        "bins": bins,
+        "data_version": data_version,
+        "computed_at": datetime.utcnow()
+    }
+
+
+async def get_data_version() -> int:
+    """Current version of the turbines collection (0 if it was never loaded)."""
+    doc = await db.database[VERSION_COLLECTION].find_one({"_id": TURBINES_VERSION_ID})
+    return doc["version"] if doc else 0
+
+
+async def load_partial_curves(turbine_id: int, months: List[str],
+                              wind_speed_interval: float, quality: str = "all") -> List[dict]:
+    """
+    Get the stored partial curves for these months.
+
+    Months that are missing or were built from older data are computed with
+    one aggregation and saved for next time. Bin sizes outside
+    STORED_WIND_SPEED_INTERVALS are computed the same way but not saved.
+    """
+    store = db.database[STORE_COLLECTION]
+    data_version = await get_data_version()
+    keep = wind_speed_interval in STORED_WIND_SPEED_INTERVALS
+
+    partials = {}
+    if keep:
+        cursor = store.find({
+            "turbine_id": turbine_id,
+            "period": {"$in": months},
+            "wind_speed_interval": wind_speed_interval,
+            "quality": quality,
+            "data_version": data_version
+        })
+        async for doc in cursor:
+            partials[doc["period"]] = doc
+
+    missing = [month for month in months if month not in partials]
+    if missing:
+        start, _ = month_bounds(missing[0])
+        _, end = month_bounds(missing[-1])
+        match = {
+            "turbine_id": turbine_id,
+            "epoch_minute": {"$gte": to_epoch_minute(start), "$lt": to_epoch_minute(end)},
+            **quality_filter(quality)
+        }
+        computed = {}
+        pipeline = monthly_curves_pipeline(match, wind_speed_interval)
+        async with store_limiter:
+            async for doc in db.database.turbines.aggregate(pipeline, maxTimeMS=ANALYTICS_MAX_TIME_MS):
+                computed[doc["_id"]["period"]] = doc["bins"]
+
+        # Months without readings are stored too, so we don't look again
+        for month in missing:
+            partials[month] = store_document(turbine_id, month, wind_speed_interval, quality,
+                                             computed.get(month, []), data_version)
+
+        if keep:
+            # The driver is already loaded by now, importing it here keeps startup lean
+            from pymongo import ReplaceOne
+            await store.bulk_write([
+                ReplaceOne(
+                    {"turbine_id": turbine_id, "period": month,
+                     "wind_speed_interval": wind_speed_interval, "quality": quality},
+                    partials[month],
+                    upsert=True
+                )
+                for month in missing
+            ], ordered=False)
+
+    return [partials[month] for month in months]
+
+
+async def load_range_edges(turbine_id: int, start_time: datetime, end_time: datetime,
+                           months: List[str], wind_speed_interval: float,
+                           quality: str = "all") -> List[dict]:
+    """
+    Partial curves for the parts of a range outside its whole months:
+    from start_time to the first whole month and from the last whole month
+    to end_time. These are read from the readings and never stored.
+    """
+    first_month_start = to_epoch_minute(month_bounds(months[0])[0])
+    last_month_end = to_epoch_minute(month_bounds(months[-1])[1])
+    match = {
+        "turbine_id": turbine_id,
+        "$or": [
+            {"epoch_minute": {"$gte": to_epoch_minute(start_time), "$lt": first_month_start}},
+            {"epoch_minute": {"$gte": last_month_end, "$lte": to_epoch_minute(end_time)}}
+        ],
+        **quality_filter(quality)
+    }
+    pipeline = monthly_curves_pipeline(match, wind_speed_interval)
+    async with store_limiter:
+        return [doc async for doc in db.database.turbines.aggregate(pipeline, maxTimeMS=ANALYTICS_MAX_TIME_MS)]
+
+
+def rebuild_power_curve_store(sync_db, wind_speed_interval: float = DEFAULT_WIND_SPEED_INTERVAL):
+    """
+    Bump the data version and rebuild every monthly curve (used by the loader).
+    """
+    version_doc = sync_db[VERSION_COLLECTION].find_one_and_update(
+        {"_id": TURBINES_VERSION_ID},
+        {"$inc": {"version": 1}},
+        upsert=True,
+        return_document=True
+    )
+    data_version = version_doc["version"]
+
+    store = sync_db[STORE_COLLECTION]
+    store.create_index(
+        [("turbine_id", 1), ("wind_speed_interval", 1), ("quality", 1), ("period", 1)],
+        unique=True
+    )
+    store.delete_many({})
+
+    documents = [
+        store_document(doc["_id"]["turbine_id"], doc["_id"]["period"],
+                       wind_speed_interval, quality, doc["bins"], data_version)
+        for quality in QUALITY_OPTIONS
+        for doc in sync_db.turbines.aggregate(
+            monthly_curves_pipeline(quality_filter(quality), wind_speed_interval), allowDiskUse=True
+        )
+    ]
+    if documents:
+        # API workers may already have stored some of these months for the
+        # new version, so replace instead of insert
+        from pymongo import ReplaceOne
+        store.bulk_write([
+            ReplaceOne(
+                {"turbine_id": doc["turbine_id"], "period": doc["period"],
+                 "wind_speed_interval": doc["wind_speed_interval"], "quality": doc["quality"]},
+                doc,
+                upsert=True
+            )
+            for doc in documents
+        ], ordered=False)
+
+    print(f"Stored {len(documents)} monthly power curves (data version {data_version}).")
@@ -0,0 +1,40 @@
+"""
+Data quality flags.
+
+The loader stores a "quality_flags" bit field on every reading. A reading with
+quality_flags == 0 passed every check; otherwise each set bit says which check
+it failed. Endpoints with quality=clean only use readings without any flag.
+"""
+import os
+
+# Same values as the previous reading in every measured column (frozen sensor)
+FLAG_FROZEN = 1
+# Power output below zero (the turbine is drawing power from the grid)
+FLAG_NEGATIVE_POWER = 2
+# Power output above what the turbine can produce
+FLAG_IMPLAUSIBLE_POWER = 4
+# Wind speed below zero or above what the anemometer can measure
+FLAG_IMPLAUSIBLE_WIND = 8
+# The turbine reported a non-zero code in the Status column
+FLAG_STATUS = 16
+
+QUALITY_FLAGS = {
+    "frozen": FLAG_FROZEN,
+    "negative_power": FLAG_NEGATIVE_POWER,
+    "implausible_power": FLAG_IMPLAUSIBLE_POWER,
+    "implausible_wind": FLAG_IMPLAUSIBLE_WIND,
+    "status": FLAG_STATUS,
+}
+
+# Limits for the plausibility checks
+MAX_PLAUSIBLE_POWER_KW = float(os.getenv("TURBINE_MAX_POWER_KW", "2500"))
+MAX_PLAUSIBLE_WIND_SPEED = float(os.getenv("TURBINE_MAX_WIND_SPEED", "40"))
+
+QUALITY_OPTIONS = ["all", "clean"]
+
+
+def quality_filter(quality: str) -> dict:
+    """MongoDB filter for a quality option ("all" or "clean")."""
+    if quality == "clean":
+        return {"quality_flags": 0}
+    return {}
@@ -0,0 +1,64 @@
+"""
+Check that AdmissionLimiter runs, queues and rejects the right number of requests.
+
+Run from the project root:
+    python3 -m app.test.check_admission
+"""
+import asyncio
+import sys
+
+from fastapi import HTTPException
+
+from app.admission import AdmissionLimiter
+from app.test.helpers import check
+
+
+async def request(limiter, hold_seconds):
+    """One request that holds its slot for a while; returns "ok" or the 503 detail."""
+    try:
+        async with limiter:
+            await asyncio.sleep(hold_seconds)
+        return "ok"
+    except HTTPException as e:
+        return e.detail
+
+
+def count(results, text):
+    return sum(text in result for result in results)
+
+
+async def check_admission():
+    ok = True
+
+    # A burst: all requests arrive in the same event loop tick
+    limiter = AdmissionLimiter("check", max_concurrent=2, max_waiting=2, wait_timeout=1)
+    results = await asyncio.gather(*[request(limiter, 0.05) for _ in range(6)])
+    ok &= check("burst: 4 requests run", count(results, "ok") == 4, str(results))
+    ok &= check("burst: 2 requests get queue full", count(results, "queue full") == 2, str(results))
+
+    # Requests arriving one after another
+    limiter = AdmissionLimiter("check", max_concurrent=2, max_waiting=2, wait_timeout=1)
+    tasks = []
+    for _ in range(6):
+        tasks.append(asyncio.create_task(request(limiter, 0.1)))
+        await asyncio.sleep(0.01)
+    results = await asyncio.gather(*tasks)
+    ok &= check("spaced: 4 requests run", count(results, "ok") == 4, str(results))
+    ok &= check("spaced: 2 requests get queue full", count(results, "queue full") == 2, str(results))
+
+    # Waiting longer than wait_timeout
+    limiter = AdmissionLimiter("check", max_concurrent=1, max_waiting=1, wait_timeout=0.05)
+    results = await asyncio.gather(request(limiter, 0.2), request(limiter, 0.2))
+    ok &= check("slow slot: the waiting request times out", "timed out" in results[1], str(results))
+
+    # Slots are given back, also when the request fails
+    ok &= check("counters are back to zero", limiter.active == 0 and limiter.waiting == 0,
+                f"active={limiter.active}, waiting={limiter.waiting}")
+    results = await asyncio.gather(request(limiter, 0))
+    ok &= check("limiter admits again afterwards", results == ["ok"], str(results))
+
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(check_admission()) else 1)
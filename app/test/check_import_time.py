@@ -0,0 +1,66 @@
+"""
+Measure how long `import app.main` takes and which heavy modules it pulls in.
+
+Importing fastapi alone takes most of the time and varies a lot from run to
+run, so the budget only covers what app.main adds on top of fastapi.
+
+Run from the project root:
+    python3 -m app.test.check_import_time
+"""
+import subprocess
+import sys
+
+# Loader-only dependencies that the API process must never import
+FORBIDDEN_MODULES = ["pandas", "requests", "numpy"]
+# Import budget for app.main in milliseconds, not counting fastapi itself
+IMPORT_BUDGET_MS = 250
+
+
+def check_import_time():
+    """Import app.main in a fresh interpreter with -X importtime and report."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print("❌ Importing app.main failed:")
+        print(result.stderr.splitlines()[-1] if result.stderr else "(no output)")
+        return False
+
+    # Lines look like: "import time:  self [us] | cumulative | imported package"
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = int(cumulative_us)
+
+    total_ms = timings.get("app.main", 0) / 1000
+    fastapi_ms = timings.get("fastapi", 0) / 1000
+    own_ms = total_ms - fastapi_ms
+    print(
+        f"import app.main: {total_ms:.1f} ms, of which fastapi {fastapi_ms:.1f} ms "
+        f"and the rest {own_ms:.1f} ms (budget {IMPORT_BUDGET_MS} ms)"
+    )
+
+    slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)[:10]
+    print("\nSlowest imports (cumulative):")
+    for name, cumulative_us in slowest:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    ok = True
+    loaded = [module for module in FORBIDDEN_MODULES if module in timings]
+    if loaded:
+        print(f"\n❌ app.main imports loader-only modules: {', '.join(loaded)}")
+        ok = False
+    if own_ms > IMPORT_BUDGET_MS:
+        print(f"\n❌ app.main takes more than {IMPORT_BUDGET_MS} ms longer to import than fastapi")
+        ok = False
+    if ok:
+        print("\n✓ Import time is within budget")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check_import_time() else 1)
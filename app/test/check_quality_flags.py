@@ -0,0 +1,79 @@
+"""
+Check the quality flags the turbine loader puts on each reading.
+
+Run from the project root:
+    python3 -m app.test.check_quality_flags
+"""
+import sys
+
+import pandas as pd
+
+from app.quality import (
+    FLAG_FROZEN,
+    FLAG_IMPLAUSIBLE_POWER,
+    FLAG_IMPLAUSIBLE_WIND,
+    FLAG_NEGATIVE_POWER,
+    FLAG_STATUS,
+    MAX_PLAUSIBLE_POWER_KW,
+)
+from app.test.helpers import check
+from app.turbine_loader import flag_quality, parse_turbine_csv
+
+
+def sample_frame():
+    """Readings that each trip exactly one check (row 0 is clean)."""
+    rows = [
+        # wind, power, rotor, status
+        (5.8, 268.5, 10.0, 0),     # 0 clean
+        (5.8, 268.5, 10.0, 0),     # 1 frozen: same as row 0
+        (6.1, -12.6, 10.5, 0),     # 2 negative power
+        (12.0, MAX_PLAUSIBLE_POWER_KW + 1, 15.0, 0),  # 3 implausible power
+        (-1.0, 10.0, 1.0, 0),      # 4 implausible wind
+        (7.0, 300.0, 11.0, 9999),  # 5 status code
+        (7.0, 300.0, 11.0, 9999),  # 6 frozen and status code
+    ]
+    df = pd.DataFrame(rows, columns=["wind_speed", "power_output", "Rotor", "Status"])
+    df["timestamp"] = pd.date_range("2016-01-01", periods=len(df), freq="10min")
+    df["epoch_minute"] = range(0, 10 * len(df), 10)
+    df["turbine_id"] = 1
+    return df
+
+
+def check_quality_flags():
+    ok = True
+
+    flags = flag_quality(sample_frame())["quality_flags"].tolist()
+    expected = [
+        0,
+        FLAG_FROZEN,
+        FLAG_NEGATIVE_POWER,
+        FLAG_IMPLAUSIBLE_POWER,
+        FLAG_IMPLAUSIBLE_WIND,
+        FLAG_STATUS,
+        FLAG_FROZEN | FLAG_STATUS,
+    ]
+    for row, (got, want) in enumerate(zip(flags, expected)):
+        ok &= check(f"row {row} flags = {want}", got == want, f"got {got}")
+
+    # The shipped data: the first two rows of turbine_1.csv are identical
+    try:
+        df = flag_quality(parse_turbine_csv("data/turbine_1.csv", 1))
+    except FileNotFoundError:
+        print("(data/turbine_1.csv not found, skipping real data checks)")
+        return ok
+
+    ok &= check("turbine_1 row 0 is not frozen", not df["quality_flags"].iloc[0] & FLAG_FROZEN)
+    ok &= check("turbine_1 row 1 is frozen", bool(df["quality_flags"].iloc[1] & FLAG_FROZEN))
+    negative = int((df["power_output"] < 0).sum())
+    flagged = int(((df["quality_flags"] & FLAG_NEGATIVE_POWER) != 0).sum())
+    ok &= check("every negative power reading is flagged", negative == flagged, f"{flagged} of {negative}")
+    status = int((df["Status"] != 0).sum())
+    flagged = int(((df["quality_flags"] & FLAG_STATUS) != 0).sum())
+    ok &= check("every non-zero Status is flagged", status == flagged, f"{flagged} of {status}")
+    print(f"turbine_1: {int((df['quality_flags'] == 0).sum())} of {len(df)} readings are clean")
+
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check_quality_flags() else 1)
@@ -0,0 +1,99 @@
+"""
+Check how CSV timestamps are converted to UTC and epoch minutes.
+
+Run from the project root:
+    python3 -m app.test.check_timestamp_conversion
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+from app.time_utils import data_tzinfo, from_epoch_minute, parse_timezone, to_epoch_minute, to_utc
+from app.test.helpers import check
+from app.turbine_loader import parse_turbine_csv
+
+HEADER = "         Dat/Zeit;  Wind;Leistung; Status\n                 ;   m/s;      kW;       \n"
+
+
+def write_csv(rows):
+    """Write a tiny turbine CSV with the given timestamps and return its path."""
+    f = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8")
+    f.write(HEADER)
+    for i, timestamp in enumerate(rows):
+        f.write(f"{timestamp};5,{i};100,5;0\n")
+    f.close()
+    return f.name
+
+
+def check_timestamp_conversion():
+    ok = True
+
+    # The shipped files: 10-minute series through the spring DST night
+    spring = [f"27.03.2016, {h:02d}:{m:02d}" for h in (1, 2, 3) for m in range(0, 60, 10)]
+    path = write_csv(spring)
+    try:
+        df = parse_turbine_csv(path, 1, source_timezone="+01:00")
+    finally:
+        os.remove(path)
+
+    ok &= check("fixed +01:00 keeps every row", len(df) == len(spring), f"{len(df)} of {len(spring)}")
+    ok &= check(
+        "01:00 local is 00:00 UTC",
+        df["timestamp"].iloc[0] == datetime(2016, 3, 27, 0, 0),
+        str(df["timestamp"].iloc[0]),
+    )
+    ok &= check(
+        "03:00 local is 02:00 UTC (no summer time jump)",
+        df["timestamp"].iloc[12] == datetime(2016, 3, 27, 2, 0),
+        str(df["timestamp"].iloc[12]),
+    )
+    steps = df["epoch_minute"].diff().dropna().unique().tolist()
+    ok &= check("epoch_minute steps by 10", steps == [10], str(steps))
+    ok &= check(
+        "epoch_minute matches timestamp",
+        int(df["epoch_minute"].iloc[0]) == to_epoch_minute(datetime(2016, 3, 27, 1, 0)),
+    )
+
+    # A Berlin-time file: the skipped spring hour is dropped (and reported)
+    path = write_csv(spring)
+    try:
+        berlin = parse_turbine_csv(path, 1, source_timezone="Europe/Berlin")
+    finally:
+        os.remove(path)
+    ok &= check("Europe/Berlin drops the 6 non-existent rows", len(berlin) == len(spring) - 6, str(len(berlin)))
+
+    # A Berlin-time file: the repeated autumn hour maps to two different UTC hours
+    autumn = [f"30.10.2016, 02:{m:02d}" for m in range(0, 60, 10)] * 2
+    path = write_csv(autumn)
+    try:
+        berlin = parse_turbine_csv(path, 1, source_timezone="Europe/Berlin")
+    finally:
+        os.remove(path)
+    ok &= check(
+        "Europe/Berlin repeated hour gets unique UTC times",
+        berlin["epoch_minute"].is_unique and len(berlin) == len(autumn),
+    )
+    ok &= check(
+        "first 02:00 is summer time (00:00 UTC)",
+        berlin["timestamp"].iloc[0] == datetime(2016, 10, 30, 0, 0),
+        str(berlin["timestamp"].iloc[0]),
+    )
+
+    # Query-side helpers
+    ok &= check("parse_timezone reads offsets", parse_timezone("+01:00").utcoffset(None).total_seconds() == 3600)
+    ok &= check(
+        "naive query times use the data time zone",
+        to_utc(datetime(2016, 1, 1)) == to_utc(datetime(2016, 1, 1, tzinfo=data_tzinfo())),
+    )
+    ok &= check(
+        "epoch minutes round-trip",
+        from_epoch_minute(to_epoch_minute(datetime.fromisoformat("2016-03-27T03:00:00+01:00")))
+        == datetime.fromisoformat("2016-03-27T02:00:00+00:00"),
+    )
+
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check_timestamp_conversion() else 1)
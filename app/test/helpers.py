@@ -0,0 +1,9 @@
+"""
+Small helpers shared by the check scripts in this folder.
+"""
+
+
+def check(name, condition, details=""):
+    """Print one ✓/❌ line and return the result, so checks can be chained with ok &= ..."""
+    print(f"{'✓' if condition else '❌'} {name}{': ' + details if details and not condition else ''}")
+    return condition
@@ -0,0 +1,57 @@
+"""
+Time zone helpers shared by the loader and the API.
+
+The turbine CSV files use the logger's wall-clock time. We store every
+reading in UTC, plus an integer "epoch_minute" (minutes since 1970-01-01 UTC)
+that range filters and bucketing use instead of datetime arithmetic.
+"""
+import os
+import re
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+# Time zone the CSV timestamps (and times sent without an offset) are in.
+# Either a fixed offset like "+01:00" or an IANA name like "Europe/Berlin".
+# The shipped loggers stay on UTC+01:00 all year (they don't switch to summer
+# time: 27.03.2016 02:00-02:50 is in the files), hence the fixed default.
+DATA_TIMEZONE = os.getenv("TURBINE_DATA_TIMEZONE", "+01:00")
+
+
+@lru_cache(maxsize=None)
+def parse_timezone(name: str) -> tzinfo:
+    """Turn "+01:00" into a fixed offset and anything else into a ZoneInfo."""
+    match = re.fullmatch(r"([+-])(\d{2}):?(\d{2})", name.strip())
+    if match:
+        sign = 1 if match.group(1) == "+" else -1
+        offset = timedelta(hours=int(match.group(2)), minutes=int(match.group(3)))
+        return timezone(sign * offset)
+    return ZoneInfo(name)
+
+
+def data_tzinfo() -> tzinfo:
+    """The tzinfo for DATA_TIMEZONE."""
+    return parse_timezone(DATA_TIMEZONE)
+
+
+def to_utc(value: datetime) -> datetime:
+    """
+    Convert a datetime to UTC.
+
+    Times without an offset are read in DATA_TIMEZONE, the same clock the
+    CSV files use, so the frontend's plain "2016-01-01T00:00:00" keeps
+    meaning what it always did.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=data_tzinfo())
+    return value.astimezone(timezone.utc)
+
+
+def to_epoch_minute(value: datetime) -> int:
+    """Minutes since 1970-01-01 UTC."""
+    return int(to_utc(value).timestamp()) // 60
+
+
+def from_epoch_minute(epoch_minute: int) -> datetime:
+    """The UTC datetime for an epoch minute."""
+    return datetime.fromtimestamp(epoch_minute * 60, tz=timezone.utc)
@@ -1,17 +1,196 @@
 import requests
 import pandas as pd
 from app.database import get_sync_db
+from app.power_curve_store import rebuild_power_curve_store
+from app.quality import (
+    FLAG_FROZEN,
+    FLAG_IMPLAUSIBLE_POWER,
+    FLAG_IMPLAUSIBLE_WIND,
+    FLAG_NEGATIVE_POWER,
+    FLAG_STATUS,
+    MAX_PLAUSIBLE_POWER_KW,
+    MAX_PLAUSIBLE_WIND_SPEED,
+    QUALITY_FLAGS,
+)
+from app.time_utils import DATA_TIMEZONE, parse_timezone
+import hashlib
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# pyarrow is optional: without it every run simply parses the CSV again
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
 
 TURBINE_URLS = {
     1: os.getenv("TURBINE_1_URL"),
     2: os.getenv("TURBINE_2_URL"),
 }
 DATA_DIR = "data"
+PARSED_DIR = os.path.join(DATA_DIR, "parsed")
+# Bump this whenever parse_turbine_csv changes what it produces
+PARSED_SCHEMA_VERSION = 1
+
+
+def parse_turbine_csv(file_path, turbine_id, source_timezone=None):
+    """
+    Parses a German-formatted turbine CSV file into a clean DataFrame.
+
+    source_timezone is the clock the file was written in ("+01:00" or an
+    IANA name); it defaults to TURBINE_DATA_TIMEZONE.
+    """
+    source_timezone = source_timezone or DATA_TIMEZONE
+    df = pd.read_csv(
+        file_path,
+        sep=";",
+        decimal=",",
+        skiprows=[1],
+        on_bad_lines="skip",
+    )
+
+    # Clean up column names by removing leading/trailing spaces
+    df.columns = df.columns.str.strip()
+
+    # Rename the columns to be database-friendly
+    df.rename(
+        columns={
+            "Dat/Zeit": "timestamp",
+            "Wind": "wind_speed",
+            "Leistung": "power_output",
+        },
+        inplace=True,
+    )
+
+    # Add the turbine_id to each record
+    df["turbine_id"] = turbine_id
+
+    # Convert timestamp to datetime objects, specifying the format
+    local_time = pd.to_datetime(
+        df["timestamp"], format="%d.%m.%Y, %H:%M", errors="coerce"
+    )
+    unparsed = int(local_time.isna().sum())
+
+    # With a fixed offset this is a plain shift. With a time zone that has
+    # summer time, the hour repeated in autumn is resolved by order (first
+    # occurrence is summer time) and times inside the skipped spring hour
+    # cannot be placed, so they become NaT.
+    first_occurrence = (~local_time.duplicated()).to_numpy()
+    utc_time = local_time.dt.tz_localize(
+        parse_timezone(source_timezone), ambiguous=first_occurrence, nonexistent="NaT"
+    ).dt.tz_convert("UTC")
+    nonexistent = int(utc_time.isna().sum()) - unparsed
+    if unparsed:
+        print(f"Turbine {turbine_id}: dropped {unparsed} rows with unreadable timestamps.")
+    if nonexistent:
+        print(
+            f"Turbine {turbine_id}: dropped {nonexistent} rows whose time does not exist "
+            f"in {source_timezone} (check TURBINE_DATA_TIMEZONE)."
+        )
+    df["timestamp"] = utc_time.dt.tz_localize(None)
+
+    # Drop rows where any of our key columns have invalid data
+    before = len(df)
+    df.dropna(subset=["timestamp", "wind_speed", "power_output"], inplace=True)
+    missing_values = before - len(df) - unparsed - nonexistent
+    if missing_values:
+        print(f"Turbine {turbine_id}: dropped {missing_values} rows without wind speed or power.")
+
+    # Minutes since the epoch, for cheap integer range queries
+    df["epoch_minute"] = (
+        df["timestamp"] - pd.Timestamp("1970-01-01")
+    ) // pd.Timedelta(minutes=1)
+
+    return df.reset_index(drop=True)
+
+
+def parsed_cache_path(file_path, turbine_id):
+    """
+    Where the parsed version of a CSV file is cached.
+
+    The name contains a hash of the file (plus the time zone it is read in)
+    and the schema version, so a changed file or parser never hits an old cache.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    digest.update(DATA_TIMEZONE.encode())
+    return os.path.join(
+        PARSED_DIR,
+        f"turbine_{turbine_id}.{digest.hexdigest()[:16]}.v{PARSED_SCHEMA_VERSION}.feather",
+    )
+
+
+def load_parsed_turbine_data(file_path, turbine_id):
+    """
+    Returns the parsed DataFrame for a CSV file, reading it from the
+    Feather cache when possible and writing the cache after a fresh parse.
+    A cache file that can't be read is parsed again and replaced.
+    """
+    if feather is None:
+        return parse_turbine_csv(file_path, turbine_id)
+
+    cache_path = parsed_cache_path(file_path, turbine_id)
+    if os.path.exists(cache_path):
+        try:
+            # Memory-mapping skips reading the file into a buffer first;
+            # to_pandas() still builds a regular (copied) DataFrame
+            df = feather.read_table(cache_path, memory_map=True).to_pandas()
+            print(f"Using parsed cache {cache_path}.")
+            return df
+        except Exception as e:
+            print(f"Parsed cache {cache_path} is unreadable, parsing the CSV again: {e}")
+
+    df = parse_turbine_csv(file_path, turbine_id)
+
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        os.makedirs(PARSED_DIR, exist_ok=True)
+        # Write next to the final file and rename, so an interrupted write
+        # never leaves a half-written cache behind
+        feather.write_feather(df, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, cache_path)
+        # Remove caches of older versions of this file
+        for name in os.listdir(PARSED_DIR):
+            if name.startswith(f"turbine_{turbine_id}.") and os.path.join(PARSED_DIR, name) != cache_path:
+                os.remove(os.path.join(PARSED_DIR, name))
+        print(f"Wrote parsed cache {cache_path}.")
+    except Exception as e:
+        print(f"Could not write parsed cache for Turbine {turbine_id}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return df
+
+
+def flag_quality(df):
+    """
+    Adds a quality_flags bit field (see app.quality) to every reading.
+
+    Flags are computed on the whole frame at once and not stored in the
+    parsed cache, so changed limits apply on the next load.
+    """
+    flags = pd.Series(0, index=df.index, dtype="int64")
+
+    # Frozen sensor: every measured value equals the previous reading
+    measured = df.drop(columns=["timestamp", "epoch_minute", "turbine_id"]).select_dtypes("number")
+    previous = measured.shift()
+    same = measured.eq(previous) | (measured.isna() & previous.isna())
+    flags[same.all(axis=1) & previous.notna().any(axis=1)] |= FLAG_FROZEN
+
+    flags[df["power_output"] < 0] |= FLAG_NEGATIVE_POWER
+    flags[df["power_output"] > MAX_PLAUSIBLE_POWER_KW] |= FLAG_IMPLAUSIBLE_POWER
+    flags[(df["wind_speed"] < 0) | (df["wind_speed"] > MAX_PLAUSIBLE_WIND_SPEED)] |= FLAG_IMPLAUSIBLE_WIND
+    if "Status" in df.columns:
+        flags[df["Status"].fillna(0) != 0] |= FLAG_STATUS
+
+    df["quality_flags"] = flags
+    return df
+
 
 def load_turbine_data():
     """Downloads, parses, and loads turbine CSV data into MongoDB."""
@@ -44,40 +223,15 @@ def load_turbine_data():
         else:
             print(f"Using existing file for Turbine {turbine_id}.")
 
-        # Parse the CSV and load into MongoDB
+        # Parse the CSV (or read the parsed cache) and load into MongoDB
         print(f"Parsing CSV file for Turbine {turbine_id}...")
         try:
-            df = pd.read_csv(
-                file_path,
-                sep=";",
-                decimal=",",
-                skiprows=[1],
-                on_bad_lines="skip",
-            )
-
-            # Clean up column names by removing leading/trailing spaces
-            df.columns = df.columns.str.strip()
-
-            # Rename the columns to be database-friendly
-            df.rename(
-                columns={
-                    "Dat/Zeit": "timestamp",
-                    "Wind": "wind_speed",
-                    "Leistung": "power_output",
-                },
-                inplace=True,
-            )
-
-            # Add the turbine_id to each record
-            df["turbine_id"] = turbine_id
-
-            # Convert timestamp to datetime objects, specifying the format
-            df["timestamp"] = pd.to_datetime(
-                df["timestamp"], format="%d.%m.%Y, %H:%M", errors="coerce"
-            )
-
-            # Drop rows where any of our key columns have invalid data
-            df.dropna(subset=["timestamp", "wind_speed", "power_output"], inplace=True)
+            df = flag_quality(load_parsed_turbine_data(file_path, turbine_id))
+            flagged = {
+                name: int(((df["quality_flags"] & flag) != 0).sum())
+                for name, flag in QUALITY_FLAGS.items()
+            }
+            print(f"Quality flags for Turbine {turbine_id}: {flagged}")
 
             # Convert dataframe to a list of dictionaries to insert
             records = df.to_dict("records")
@@ -93,8 +247,13 @@ def load_turbine_data():
 
     # Create indexes for faster queries
     collection.create_index([("turbine_id", 1), ("timestamp", 1)])
+    collection.create_index([("turbine_id", 1), ("epoch_minute", 1)])
+    collection.create_index([("turbine_id", 1), ("quality_flags", 1), ("epoch_minute", 1)])
     print("Created indexes on turbines collection.")
 
+    # Historical bins never change after loading, so build them once here
+    rebuild_power_curve_store(db)
+
     client.close()
 
 
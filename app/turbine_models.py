@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class TurbineReading(BaseModel):
@@ -10,8 +10,9 @@ class TurbineReading(BaseModel):
     """
     turbine_id: int = Field(..., description="Which turbine (1 or 2)")
     timestamp: datetime = Field(..., description="When the measurement was taken")
-    wind_speed: float = Field(..., ge=0, description="Wind speed in m/s (must be >= 0)")
-    power_output: float = Field(..., ge=0, description="Power output in kW (must be >= 0)")
+    wind_speed: float = Field(..., description="Wind speed in m/s (see quality_flags for implausible values)")
+    power_output: float = Field(..., description="Power output in kW (negative while drawing from the grid)")
+    quality_flags: int = Field(0, description="Failed quality checks as bit flags (0 = clean)")
 
     class Config:
         json_schema_extra = {
@@ -61,3 +62,102 @@ class PowerCurveResponse(BaseModel):
     start_time: datetime
     end_time: datetime
     curve_points: List[PowerCurvePoint]
+
+
+class TurbineCoverage(BaseModel):
+    """
+    Which part of the time range actually has readings.
+    """
+    first_reading: datetime
+    last_reading: datetime
+    reading_count: int
+
+
+class TurbineDashboardResponse(BaseModel):
+    """
+    Everything the dashboard shows for one turbine, in one response.
+    """
+    turbine_id: int
+    total_reading_count: int
+    coverage: TurbineCoverage
+    statistics: dict
+    power_curve: PowerCurveResponse
+
+
+class PowerCurveComparisonPoint(BaseModel):
+    """
+    One wind speed bin compared between two periods.
+    Power values are None when a period has no readings in that bin.
+    """
+    wind_speed: float
+    baseline_power: Optional[float] = None
+    current_power: Optional[float] = None
+    power_difference: Optional[float] = None
+    percent_change: Optional[float] = None
+    baseline_count: int
+    current_count: int
+
+
+class PowerCurveComparisonResponse(BaseModel):
+    """
+    Bin-by-bin comparison of two power curves (e.g. month over month).
+    """
+    turbine_id: int
+    baseline_period: str
+    current_period: str
+    wind_speed_interval: float
+    curve_points: List[PowerCurveComparisonPoint]
+
+
+class WindSpeedBin(BaseModel):
+    """
+    How often the wind blew in one wind speed interval.
+    """
+    wind_speed: float
+    reading_count: int
+    frequency: float = Field(..., description="Share of all readings in this bin (0-1)")
+
+
+class WeibullFit(BaseModel):
+    """
+    Weibull distribution fitted to the wind speeds.
+    """
+    k: float = Field(..., description="Shape parameter")
+    c: float = Field(..., description="Scale parameter in m/s")
+    mean_wind_speed: float
+    std_wind_speed: float
+
+
+class WindDistributionResponse(BaseModel):
+    """
+    Wind speed frequency distribution and Weibull fit for one turbine.
+    """
+    turbine_id: int
+    start_time: datetime
+    end_time: datetime
+    reading_count: int
+    wind_speed_interval: float
+    bins: List[WindSpeedBin]
+    weibull: Optional[WeibullFit] = None
+
+
+class ResampleBucket(BaseModel):
+    """
+    Aggregated values for one time bucket.
+    Keys of values look like "power_output_mean" or "wind_speed_max".
+    """
+    timestamp: datetime
+    reading_count: int
+    values: Dict[str, Optional[float]]
+
+
+class ResampleResponse(BaseModel):
+    """
+    Time series resampled into equal time buckets.
+    """
+    turbine_id: int
+    interval: str
+    fields: List[str]
+    aggregations: List[str]
+    bucket_count: int
+    buckets: List[ResampleBucket]
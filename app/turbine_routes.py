@@ -1,14 +1,62 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+import asyncio
+import json
+import math
+import re
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional
 from datetime import datetime
 from app.database import db
+from app.admission import ANALYTICS_MAX_TIME_MS, AdmissionLimiter, admission_limited
+from app.cache import cached
+from app.live_updates import SUBSCRIBER_QUEUE_SIZE, hub
+from app.power_curve_store import (
+    MAX_PERIOD_MONTHS,
+    load_partial_curves,
+    load_range_edges,
+    merge_partial_curves,
+    month_bounds,
+    parse_period,
+    partial_time_range,
+    whole_months_between,
+    wind_speed_bin
+)
+from app.quality import quality_filter
+from app.time_utils import DATA_TIMEZONE, to_epoch_minute
 from app.turbine_models import (
     TurbineReading,
     TurbineDataResponse,
     PowerCurveResponse,
-    PowerCurvePoint
+    PowerCurvePoint,
+    PowerCurveComparisonPoint,
+    PowerCurveComparisonResponse,
+    ResampleBucket,
+    ResampleResponse,
+    TurbineCoverage,
+    TurbineDashboardResponse,
+    WeibullFit,
+    WindDistributionResponse,
+    WindSpeedBin
 )
 
+# Units accepted by /resample, mapped to $dateTrunc units
+RESAMPLE_UNITS = {"min": "minute", "h": "hour", "d": "day", "w": "week"}
+# Aggregations accepted by /resample, mapped to $group operators
+RESAMPLE_AGGREGATIONS = {"mean": "$avg", "min": "$min", "max": "$max", "sum": "$sum"}
+RESAMPLE_FIELDS = ["power_output", "wind_speed"]
+# Turbines that have data; /live only follows these
+KNOWN_TURBINE_IDS = [1, 2]
+# Seconds between keep-alive comments on an idle live stream
+LIVE_KEEPALIVE_SECONDS = 15
+
+# Each analytics query type gets its own concurrency limit and wait queue
+power_curve_limiter = AdmissionLimiter("power curve")
+statistics_limiter = AdmissionLimiter("statistics")
+coverage_limiter = AdmissionLimiter("coverage")
+count_limiter = AdmissionLimiter("reading count")
+wind_distribution_limiter = AdmissionLimiter("wind distribution")
+resample_limiter = AdmissionLimiter("resample")
+
 # Create a router - like a mini-app for turbine endpoints
 router = APIRouter(
     prefix="/turbines",
@@ -24,9 +72,11 @@ async def get_turbine_info():
 
     Like asking: "What turbines do you have data for?"
     """
-    # Count readings for each turbine
-    turbine_1_count = await db.database.turbines.count_documents({"turbine_id": 1})
-    turbine_2_count = await db.database.turbines.count_documents({"turbine_id": 2})
+    # Count readings for each turbine (both counts run at the same time)
+    turbine_1_count, turbine_2_count = await asyncio.gather(
+        compute_reading_count(1, "all"),
+        compute_reading_count(2, "all")
+    )
 
     return {
         "turbines": [
@@ -36,99 +86,90 @@ async def get_turbine_info():
     }
 
 
-@router.get("/{turbine_id}/data", response_model=TurbineDataResponse)
-async def get_turbine_data(
+
+def build_time_query(
     turbine_id: int,
-    start_time: Optional[datetime] = Query(None, description="Start time for filtering"),
-    end_time: Optional[datetime] = Query(None, description="End time for filtering"),
-    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of readings")
-):
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    quality: str = "all"
+) -> dict:
     """
-    Get raw time series data for a specific turbine.
+    Build the MongoDB filter for one turbine and an optional time range.
 
-    Like asking: "Show me all measurements from Turbine 1 between January and February"
-
-    Args:
-        turbine_id: Which turbine (1 or 2)
-        start_time: Only get data after this time
-        end_time: Only get data before this time
-        limit: Maximum number of readings to return
+    Either bound can be left out to get an open-ended range. Times may carry
+    an offset (2016-01-01T00:00:00+01:00); times without one are read as
+    local time of the site. The filter runs on the integer epoch_minute field.
+    quality="clean" keeps only readings without quality flags.
     """
-    # Build the query
-    query = {"turbine_id": turbine_id}
-
-    # Add time filters if provided
+    query = {"turbine_id": turbine_id, **quality_filter(quality)}
     if start_time or end_time:
-        query["timestamp"] = {}
+        query["epoch_minute"] = {}
         if start_time:
-            query["timestamp"]["$gte"] = start_time
+            query["epoch_minute"]["$gte"] = to_epoch_minute(start_time)
         if end_time:
-            query["timestamp"]["$lte"] = end_time
+            query["epoch_minute"]["$lte"] = to_epoch_minute(end_time)
+    return query
 
-    # Get readings from database
-    readings = []
-    cursor = db.database.turbines.find(query).sort("timestamp", 1).limit(limit)
 
-    async for doc in cursor:
-        # Remove MongoDB's internal _id field
-        doc.pop('_id', None)
-        readings.append(TurbineReading(**doc))
+@cached()
+async def compute_power_curve(
+    turbine_id: int,
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    wind_speed_interval: float,
+    quality: str
+) -> Optional[PowerCurveResponse]:
+    """
+    Build the power curve for a time range. Returns None when there is no data.
 
-    if not readings:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No data found for turbine {turbine_id}"
-        )
+    Whole months inside the range come from the stored monthly curves and
+    only the days around them are read from the readings. Open-ended ranges
+    and ranges without a whole month are scanned as a whole.
+    """
+    months = whole_months_between(start_time, end_time)
+    if not months:
+        return await scan_power_curve(turbine_id, start_time, end_time, wind_speed_interval, quality)
 
-    # Create response
-    return TurbineDataResponse(
+    stored, edges = await asyncio.gather(
+        load_partial_curves(turbine_id, months, wind_speed_interval, quality),
+        load_range_edges(turbine_id, start_time, end_time, months, wind_speed_interval, quality)
+    )
+    partials = stored + edges
+    curve_points = merge_partial_curves(partials)
+    if not curve_points:
+        return None
+
+    first_time, last_time = partial_time_range(partials)
+    return PowerCurveResponse(
         turbine_id=turbine_id,
-        reading_count=len(readings),
-        start_time=readings[0].timestamp,
-        end_time=readings[-1].timestamp,
-        readings=readings
+        # Curves stored before reading times were kept fall back to the month bounds
+        start_time=first_time or month_bounds(months[0])[0],
+        end_time=last_time or month_bounds(months[-1])[1],
+        curve_points=curve_points
     )
 
 
-@router.get("/{turbine_id}/power-curve", response_model=PowerCurveResponse)
-async def get_power_curve(
+@admission_limited(power_curve_limiter)
+async def scan_power_curve(
     turbine_id: int,
-    start_time: Optional[datetime] = Query(None),
-    end_time: Optional[datetime] = Query(None),
-    wind_speed_interval: float = Query(0.5, description="Wind speed grouping interval")
-):
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    wind_speed_interval: float,
+    quality: str
+) -> Optional[PowerCurveResponse]:
     """
-    Get power curve data (average power vs wind speed).
-
-    A power curve shows the relationship between wind speed and power output.
-    This helps identify if a turbine is performing well.
-
-    Args:
-        turbine_id: Which turbine
-        start_time: Start of time range
-        end_time: End of time range
-        wind_speed_interval: Group wind speeds by this interval (e.g., 0.5 m/s)
+    Run the power curve aggregation over every reading in the range.
+    Returns None when there is no data.
     """
     # Build aggregation pipeline
     # This is like a series of data processing steps
     pipeline = [
         # Step 1: Filter by turbine and time
-        {
-            "$match": {
-                "turbine_id": turbine_id,
-                **({"timestamp": {"$gte": start_time, "$lte": end_time}}
-                   if start_time and end_time else {})
-            }
-        },
+        {"$match": build_time_query(turbine_id, start_time, end_time, quality)},
         # Step 2: Group by wind speed intervals
         {
             "$group": {
-                "_id": {
-                    "$multiply": [
-                        {"$floor": {"$divide": ["$wind_speed", wind_speed_interval]}},
-                        wind_speed_interval
-                    ]
-                },
+                "_id": wind_speed_bin(wind_speed_interval),
                 "average_power": {"$avg": "$power_output"},
                 "reading_count": {"$sum": 1},
                 "min_time": {"$min": "$timestamp"},
@@ -146,7 +187,7 @@ async def get_power_curve(
     min_time = None
     max_time = None
 
-    async for doc in db.database.turbines.aggregate(pipeline):
+    async for doc in db.database.turbines.aggregate(pipeline, maxTimeMS=ANALYTICS_MAX_TIME_MS):
         curve_points.append(PowerCurvePoint(
             wind_speed=doc["_id"],
             average_power=round(doc["average_power"], 2),
@@ -159,10 +200,7 @@ async def get_power_curve(
             max_time = doc["max_time"]
 
     if not curve_points:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No data found for turbine {turbine_id}"
-        )
+        return None
 
     return PowerCurveResponse(
         turbine_id=turbine_id,
@@ -172,29 +210,20 @@ async def get_power_curve(
     )
 
 
-@router.get("/{turbine_id}/statistics", response_model=dict)
-async def get_turbine_statistics(
+@cached()
+@admission_limited(statistics_limiter)
+async def compute_statistics(
     turbine_id: int,
-    start_time: Optional[datetime] = Query(None),
-    end_time: Optional[datetime] = Query(None)
-):
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    quality: str
+) -> Optional[dict]:
     """
-    Get statistical summary for a turbine.
-
-    Like asking: "What's the average wind speed and power output for this turbine?"
+    Run the statistics aggregation. Returns None when there is no data.
     """
-    # Build query
-    query = {"turbine_id": turbine_id}
-    if start_time or end_time:
-        query["timestamp"] = {}
-        if start_time:
-            query["timestamp"]["$gte"] = start_time
-        if end_time:
-            query["timestamp"]["$lte"] = end_time
-
     # Aggregation to calculate statistics
     pipeline = [
-        {"$match": query},
+        {"$match": build_time_query(turbine_id, start_time, end_time, quality)},
         {
             "$group": {
                 "_id": None,
@@ -210,13 +239,10 @@ async def get_turbine_statistics(
         }
     ]
 
-    stats = await db.database.turbines.aggregate(pipeline).to_list(1)
+    stats = await db.database.turbines.aggregate(pipeline, maxTimeMS=ANALYTICS_MAX_TIME_MS).to_list(1)
 
     if not stats:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No data found for turbine {turbine_id}"
-        )
+        return None
 
     result = stats[0]
     result.pop('_id', None)
@@ -229,3 +255,562 @@ async def get_turbine_statistics(
     result['turbine_id'] = turbine_id
 
     return result
+
+
+@cached()
+@admission_limited(count_limiter)
+async def compute_reading_count(turbine_id: int, quality: str) -> int:
+    """
+    Count all readings of a turbine (no time range).
+    """
+    return await db.database.turbines.count_documents(
+        {"turbine_id": turbine_id, **quality_filter(quality)},
+        maxTimeMS=ANALYTICS_MAX_TIME_MS
+    )
+
+
+@cached()
+@admission_limited(coverage_limiter)
+async def compute_coverage(
+    turbine_id: int,
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    quality: str
+) -> Optional[TurbineCoverage]:
+    """
+    Find the first and last reading in the range. Returns None when there is no data.
+    """
+    pipeline = [
+        {"$match": build_time_query(turbine_id, start_time, end_time, quality)},
+        {
+            "$group": {
+                "_id": None,
+                "first_reading": {"$min": "$timestamp"},
+                "last_reading": {"$max": "$timestamp"},
+                "reading_count": {"$sum": 1}
+            }
+        }
+    ]
+
+    coverage = await db.database.turbines.aggregate(pipeline, maxTimeMS=ANALYTICS_MAX_TIME_MS).to_list(1)
+
+    if not coverage:
+        return None
+
+    doc = coverage[0]
+    return TurbineCoverage(
+        first_reading=doc["first_reading"],
+        last_reading=doc["last_reading"],
+        reading_count=doc["reading_count"]
+    )
+
+
+def fit_weibull(mean: float, std: float) -> Optional[WeibullFit]:
+    """
+    Fit Weibull k and c from the mean and standard deviation of wind speed.
+
+    Uses the empirical method of Justus: k = (std / mean) ^ -1.086 and
+    c = mean / Gamma(1 + 1/k). Returns None when there is no spread to fit.
+    """
+    if not mean or not std or mean <= 0:
+        return None
+    k = (std / mean) ** -1.086
+    c = mean / math.gamma(1 + 1 / k)
+    return WeibullFit(
+        k=round(k, 3),
+        c=round(c, 3),
+        mean_wind_speed=round(mean, 3),
+        std_wind_speed=round(std, 3)
+    )
+
+
+@cached()
+@admission_limited(wind_distribution_limiter)
+async def compute_wind_distribution(
+    turbine_id: int,
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    wind_speed_interval: float,
+    quality: str
+) -> Optional[WindDistributionResponse]:
+    """
+    Build the wind speed histogram and Weibull fit. Returns None when there is no data.
+    """
+    # One pass over the readings: $facet feeds the same documents to the
+    # histogram and to the summary used for the Weibull fit
+    pipeline = [
+        {"$match": build_time_query(turbine_id, start_time, end_time, quality)},
+        {"$project": {"_id": 0, "wind_speed": 1, "timestamp": 1}},
+        {
+            "$facet": {
+                "histogram": [
+                    {"$group": {"_id": wind_speed_bin(wind_speed_interval), "reading_count": {"$sum": 1}}},
+                    {"$sort": {"_id": 1}}
+                ],
+                "summary": [
+                    {
+                        "$group": {
+                            "_id": None,
+                            "count": {"$sum": 1},
+                            "mean": {"$avg": "$wind_speed"},
+                            "std": {"$stdDevPop": "$wind_speed"},
+                            "min_time": {"$min": "$timestamp"},
+                            "max_time": {"$max": "$timestamp"}
+                        }
+                    }
+                ]
+            }
+        }
+    ]
+
+    result = await db.database.turbines.aggregate(pipeline, maxTimeMS=ANALYTICS_MAX_TIME_MS).to_list(1)
+    if not result or not result[0]["summary"]:
+        return None
+
+    summary = result[0]["summary"][0]
+    total = summary["count"]
+    bins = [
+        WindSpeedBin(
+            wind_speed=doc["_id"],
+            reading_count=doc["reading_count"],
+            frequency=round(doc["reading_count"] / total, 5)
+        )
+        for doc in result[0]["histogram"]
+    ]
+
+    return WindDistributionResponse(
+        turbine_id=turbine_id,
+        start_time=summary["min_time"],
+        end_time=summary["max_time"],
+        reading_count=total,
+        wind_speed_interval=wind_speed_interval,
+        bins=bins,
+        weibull=fit_weibull(summary["mean"], summary["std"])
+    )
+
+
+def parse_csv_param(value: str, allowed: List[str], name: str) -> tuple:
+    """Split a comma separated query parameter, answering 400 for unknown items."""
+    items = tuple(dict.fromkeys(item.strip() for item in value.split(",") if item.strip()))
+    unknown = [item for item in items if item not in allowed]
+    if not items or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid {name} '{value}', choose from: {', '.join(allowed)}"
+        )
+    return items
+
+
+@cached()
+@admission_limited(resample_limiter)
+async def compute_resample(
+    turbine_id: int,
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    bin_size: int,
+    unit: str,
+    fields: tuple,
+    aggregations: tuple,
+    limit: int,
+    quality: str
+) -> List[ResampleBucket]:
+    """
+    Group readings into time buckets with $dateTrunc and aggregate them.
+    """
+    date_trunc = {
+        "date": "$timestamp",
+        "unit": unit,
+        "binSize": bin_size,
+        # Days and weeks follow the site's local calendar
+        "timezone": DATA_TIMEZONE
+    }
+    if unit == "week":
+        date_trunc["startOfWeek"] = "monday"
+
+    group = {"_id": {"$dateTrunc": date_trunc}, "reading_count": {"$sum": 1}}
+    for field in fields:
+        for aggregation in aggregations:
+            group[f"{field}_{aggregation}"] = {RESAMPLE_AGGREGATIONS[aggregation]: f"${field}"}
+
+    pipeline = [
+        {"$match": build_time_query(turbine_id, start_time, end_time, quality)},
+        # Only pass on the fields we aggregate
+        {"$project": {"_id": 0, "timestamp": 1, **{field: 1 for field in fields}}},
+        {"$group": group},
+        {"$sort": {"_id": 1}},
+        {"$limit": limit}
+    ]
+
+    buckets = []
+    async for doc in db.database.turbines.aggregate(pipeline, maxTimeMS=ANALYTICS_MAX_TIME_MS):
+        bucket_start = doc.pop("_id")
+        reading_count = doc.pop("reading_count")
+        buckets.append(ResampleBucket(
+            timestamp=bucket_start,
+            reading_count=reading_count,
+            values={key: round(value, 3) if value is not None else None for key, value in doc.items()}
+        ))
+    return buckets
+
+
+@router.get("/live")
+async def stream_live_updates(
+    request: Request,
+    turbine_ids: str = Query("1,2", description="Comma separated turbine IDs to follow")
+):
+    """
+    Follow new readings as they arrive (Server-Sent Events).
+
+    Each "reading" event carries the new reading and the turbine's updated
+    statistics, so a live dashboard doesn't have to keep polling /data and
+    /statistics. An "error" event means the feed hit a problem and is
+    retrying. All clients of a turbine share one database feed.
+
+    In the browser: new EventSource("/turbines/live?turbine_ids=1,2")
+    """
+    try:
+        ids = list(dict.fromkeys(int(item) for item in turbine_ids.split(",") if item.strip()))
+    except ValueError:
+        ids = []
+    if not ids or any(turbine_id not in KNOWN_TURBINE_IDS for turbine_id in ids):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid turbine_ids '{turbine_ids}', choose from: "
+                   f"{', '.join(str(turbine_id) for turbine_id in KNOWN_TURBINE_IDS)}"
+        )
+
+    async def event_stream():
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        for turbine_id in ids:
+            hub.subscribe(turbine_id, queue)
+        try:
+            # Tell the browser how long to wait before reconnecting
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=LIVE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                event_type = "error" if "error" in event else "reading"
+                yield f"event: {event_type}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            for turbine_id in ids:
+                hub.unsubscribe(turbine_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/{turbine_id}/data", response_model=TurbineDataResponse)
+async def get_turbine_data(
+    turbine_id: int,
+    start_time: Optional[datetime] = Query(None, description="Start time for filtering (ISO 8601, offset optional)"),
+    end_time: Optional[datetime] = Query(None, description="End time for filtering (ISO 8601, offset optional)"),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of readings"),
+    quality: Literal["all", "clean"] = Query("all", description="clean: skip readings with quality flags")
+):
+    """
+    Get raw time series data for a specific turbine.
+
+    Like asking: "Show me all measurements from Turbine 1 between January and February"
+
+    Args:
+        turbine_id: Which turbine (1 or 2)
+        start_time: Only get data after this time
+        end_time: Only get data before this time
+        limit: Maximum number of readings to return
+    """
+    # Build the query
+    query = build_time_query(turbine_id, start_time, end_time, quality)
+
+    # Get readings from database
+    readings = []
+    cursor = db.database.turbines.find(query).sort("epoch_minute", 1).limit(limit)
+
+    async for doc in cursor:
+        # Remove MongoDB's internal _id field
+        doc.pop('_id', None)
+        readings.append(TurbineReading(**doc))
+
+    if not readings:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No data found for turbine {turbine_id}"
+        )
+
+    # Create response
+    return TurbineDataResponse(
+        turbine_id=turbine_id,
+        reading_count=len(readings),
+        start_time=readings[0].timestamp,
+        end_time=readings[-1].timestamp,
+        readings=readings
+    )
+
+
+@router.get("/{turbine_id}/power-curve", response_model=PowerCurveResponse)
+async def get_power_curve(
+    turbine_id: int,
+    start_time: Optional[datetime] = Query(None),
+    end_time: Optional[datetime] = Query(None),
+    wind_speed_interval: float = Query(0.5, gt=0, description="Wind speed grouping interval"),
+    quality: Literal["all", "clean"] = Query("all", description="clean: skip readings with quality flags")
+):
+    """
+    Get power curve data (average power vs wind speed).
+
+    A power curve shows the relationship between wind speed and power output.
+    This helps identify if a turbine is performing well.
+
+    Args:
+        turbine_id: Which turbine
+        start_time: Start of time range
+        end_time: End of time range
+        wind_speed_interval: Group wind speeds by this interval (e.g., 0.5 m/s)
+    """
+    curve = await compute_power_curve(turbine_id, start_time, end_time, wind_speed_interval, quality)
+
+    if curve is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No data found for turbine {turbine_id}"
+        )
+
+    return curve
+
+
+def parse_period_or_400(period: str) -> List[str]:
+    """Parse a period query parameter, answering 400 if it is malformed."""
+    try:
+        return parse_period(period)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid period '{period}', expected YYYY-MM or YYYY-MM..YYYY-MM "
+                   f"covering at most {MAX_PERIOD_MONTHS} months"
+        )
+
+
+@router.get("/{turbine_id}/power-curve/baseline", response_model=PowerCurveResponse)
+async def get_power_curve_baseline(
+    turbine_id: int,
+    period: str = Query(..., description="Month (2016-01) or month range (2016-01..2016-03)"),
+    wind_speed_interval: float = Query(0.5, gt=0, description="Wind speed grouping interval"),
+    quality: Literal["all", "clean"] = Query("all", description="clean: skip readings with quality flags")
+):
+    """
+    Get the power curve for whole months from the stored monthly curves.
+
+    Instead of scanning every reading, the stored monthly curves are added
+    together, which is much cheaper for long periods.
+    """
+    months = parse_period_or_400(period)
+    partials = await load_partial_curves(turbine_id, months, wind_speed_interval, quality)
+    curve_points = merge_partial_curves(partials)
+
+    if not curve_points:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No data found for turbine {turbine_id} in {period}"
+        )
+
+    return PowerCurveResponse(
+        turbine_id=turbine_id,
+        start_time=month_bounds(months[0])[0],
+        end_time=month_bounds(months[-1])[1],
+        curve_points=curve_points
+    )
+
+
+@router.get("/{turbine_id}/power-curve/compare", response_model=PowerCurveComparisonResponse)
+async def compare_power_curves(
+    turbine_id: int,
+    baseline: str = Query(..., description="Reference period, e.g. 2016-01"),
+    current: str = Query(..., description="Period to compare, e.g. 2016-02"),
+    wind_speed_interval: float = Query(0.5, gt=0, description="Wind speed grouping interval"),
+    quality: Literal["all", "clean"] = Query("all", description="clean: skip readings with quality flags")
+):
+    """
+    Compare the power curves of two periods bin by bin.
+
+    A current curve that sits below the baseline at the same wind speeds
+    means the turbine produces less than it used to.
+    """
+    baseline_months = parse_period_or_400(baseline)
+    current_months = parse_period_or_400(current)
+
+    baseline_partials, current_partials = await asyncio.gather(
+        load_partial_curves(turbine_id, baseline_months, wind_speed_interval, quality),
+        load_partial_curves(turbine_id, current_months, wind_speed_interval, quality)
+    )
+    baseline_points = {p.wind_speed: p for p in merge_partial_curves(baseline_partials)}
+    current_points = {p.wind_speed: p for p in merge_partial_curves(current_partials)}
+
+    if not baseline_points or not current_points:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No data found for turbine {turbine_id} in one of the periods"
+        )
+
+    comparison = []
+    for wind_speed in sorted(set(baseline_points) | set(current_points)):
+        before = baseline_points.get(wind_speed)
+        after = current_points.get(wind_speed)
+        point = PowerCurveComparisonPoint(
+            wind_speed=wind_speed,
+            baseline_power=before.average_power if before else None,
+            current_power=after.average_power if after else None,
+            baseline_count=before.reading_count if before else 0,
+            current_count=after.reading_count if after else 0
+        )
+        if before and after:
+            point.power_difference = round(after.average_power - before.average_power, 2)
+            if before.average_power:
+                point.percent_change = round(
+                    point.power_difference / before.average_power * 100, 2
+                )
+        comparison.append(point)
+
+    return PowerCurveComparisonResponse(
+        turbine_id=turbine_id,
+        baseline_period=baseline,
+        current_period=current,
+        wind_speed_interval=wind_speed_interval,
+        curve_points=comparison
+    )
+
+
+@router.get("/{turbine_id}/wind-distribution", response_model=WindDistributionResponse)
+async def get_wind_distribution(
+    turbine_id: int,
+    start_time: Optional[datetime] = Query(None),
+    end_time: Optional[datetime] = Query(None),
+    wind_speed_interval: float = Query(0.5, gt=0, description="Wind speed grouping interval"),
+    quality: Literal["all", "clean"] = Query("all", description="clean: skip readings with quality flags")
+):
+    """
+    Get the wind speed frequency distribution and a fitted Weibull k and c.
+
+    The bins use the same wind speed intervals as the power curve, so the two
+    can be combined (e.g. to estimate yearly energy yield).
+    """
+    distribution = await compute_wind_distribution(turbine_id, start_time, end_time, wind_speed_interval, quality)
+
+    if distribution is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No data found for turbine {turbine_id}"
+        )
+
+    return distribution
+
+
+@router.get("/{turbine_id}/resample", response_model=ResampleResponse)
+async def get_resampled_data(
+    turbine_id: int,
+    interval: str = Query("1h", description="Bucket size: number plus min, h, d or w (e.g. 10min, 1h, 1d, 1w)"),
+    agg: str = Query("mean", description="Comma separated: mean, min, max, sum"),
+    fields: str = Query("power_output,wind_speed", description="Comma separated fields to aggregate"),
+    start_time: Optional[datetime] = Query(None),
+    end_time: Optional[datetime] = Query(None),
+    limit: int = Query(10000, ge=1, le=100000, description="Maximum number of buckets"),
+    quality: Literal["all", "clean"] = Query("all", description="clean: skip readings with quality flags")
+):
+    """
+    Get power and wind speed resampled into equal time buckets.
+
+    Like asking: "Give me the daily average power for the whole year" - that's
+    365 rows instead of every 10-minute reading.
+    """
+    match = re.fullmatch(r"(\d+)(min|h|d|w)", interval.strip())
+    if not match or int(match.group(1)) < 1:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid interval '{interval}', expected e.g. 10min, 1h, 1d or 1w"
+        )
+    bin_size, unit = int(match.group(1)), RESAMPLE_UNITS[match.group(2)]
+    field_list = parse_csv_param(fields, RESAMPLE_FIELDS, "fields")
+    aggregation_list = parse_csv_param(agg, list(RESAMPLE_AGGREGATIONS), "agg")
+
+    buckets = await compute_resample(
+        turbine_id, start_time, end_time, bin_size, unit, field_list, aggregation_list, limit, quality
+    )
+
+    if not buckets:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No data found for turbine {turbine_id}"
+        )
+
+    return ResampleResponse(
+        turbine_id=turbine_id,
+        interval=interval,
+        fields=list(field_list),
+        aggregations=list(aggregation_list),
+        bucket_count=len(buckets),
+        buckets=buckets
+    )
+
+
+@router.get("/{turbine_id}/statistics", response_model=dict)
+async def get_turbine_statistics(
+    turbine_id: int,
+    start_time: Optional[datetime] = Query(None),
+    end_time: Optional[datetime] = Query(None),
+    quality: Literal["all", "clean"] = Query("all", description="clean: skip readings with quality flags")
+):
+    """
+    Get statistical summary for a turbine.
+
+    Like asking: "What's the average wind speed and power output for this turbine?"
+    """
+    result = await compute_statistics(turbine_id, start_time, end_time, quality)
+
+    if result is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No data found for turbine {turbine_id}"
+        )
+
+    return result
+
+
+@router.get("/{turbine_id}/dashboard", response_model=TurbineDashboardResponse)
+async def get_turbine_dashboard(
+    turbine_id: int,
+    start_time: Optional[datetime] = Query(None),
+    end_time: Optional[datetime] = Query(None),
+    wind_speed_interval: float = Query(0.5, gt=0, description="Wind speed grouping interval"),
+    quality: Literal["all", "clean"] = Query("all", description="clean: skip readings with quality flags")
+):
+    """
+    Get everything the dashboard needs for one turbine in a single request.
+
+    The power curve, statistics, coverage and total count queries run at the
+    same time, so the response takes as long as the slowest one instead of
+    the sum of all of them.
+    """
+    power_curve, statistics, coverage, total_count = await asyncio.gather(
+        compute_power_curve(turbine_id, start_time, end_time, wind_speed_interval, quality),
+        compute_statistics(turbine_id, start_time, end_time, quality),
+        compute_coverage(turbine_id, start_time, end_time, quality),
+        compute_reading_count(turbine_id, quality)
+    )
+
+    if coverage is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No data found for turbine {turbine_id}"
+        )
+
+    return TurbineDashboardResponse(
+        turbine_id=turbine_id,
+        total_reading_count=total_count,
+        coverage=coverage,
+        statistics=statistics,
+        power_curve=power_curve
+    )
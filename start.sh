@@ -1,6 +1,31 @@
-
 set -e
 
+# ./start.sh       -> start MongoDB, install, load all data, run one process with auto-reload (development)
+# ./start.sh load  -> only (re)load the data; this REPLACES the turbines collection
+# ./start.sh prod  -> only start the API, one worker per CPU core (set WEB_CONCURRENCY to change it).
+#                     Never touches Docker, dependencies or data, so it is safe on every API host.
+
+load_data() {
+    # Run BOTH data loader scripts to populate the database
+    echo "--- Loading JSONPlaceholder data (users, posts, comments)... ---"
+    python3 -m app.data_loader
+
+    echo "--- Loading Turbine data... ---"
+    python3 -m app.turbine_loader
+}
+
+if [ "$1" = "prod" ]; then
+    WORKERS="${WEB_CONCURRENCY:-$(nproc)}"
+    echo "--- Starting FastAPI application with $WORKERS workers on http://localhost:8000 ---"
+    echo "--- Workers report ready on /ready once warm-up is done ---"
+    exec python3 -m uvicorn app.main:app --workers "$WORKERS" --host 0.0.0.0 --port 8000
+fi
+
+if [ "$1" = "load" ]; then
+    load_data
+    exit 0
+fi
+
 # Start Docker services in the background
 echo "--- Starting Docker services (MongoDB & Mongo Express) ---"
 docker-compose up -d --build
@@ -13,14 +38,7 @@ sleep 5
 echo "--- Installing Python dependencies... ---"
 pip3 install -r requirements.txt
 
-# Run BOTH data loader scripts to populate the database
-
-echo "--- Loading JSONPlaceholder data (users, posts, comments)... ---"
-python3 -m app.data_loader
-
-echo "--- Loading Turbine data... ---"
-python3 -m app.turbine_loader
-# ----------------------
+load_data
 
 # Start the FastAPI application with auto-reload
 echo "--- Starting FastAPI application on http://localhost:8000 ---"